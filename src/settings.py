@@ -1,13 +1,12 @@
 """Handles the creation, validation and update of the application's settings."""
 
+import functools
 import re
 from pathlib import Path
-from tkinter import filedialog
 from typing import Literal
 
 import tomli_w
 import tomllib
-import wmi
 
 # Name of the settings file
 FILENAME = "config.toml"
@@ -29,6 +28,9 @@ PREVIEW_FORMATS = ["jpg", "png", "svg"]
 # Sorting keys for the flash drive sorting algorithm
 SORTING_KEYS = ["number", "year"]
 
+# Compiled once; the setter runs on every config load and validation
+_FLASH_NAME_RE = re.compile(r"^HAPPY\d+$")
+
 
 class Settings:
     def __init__(self) -> None:
@@ -43,15 +45,21 @@ class Settings:
         self._sorting_reverse: bool
         self._logging_debug: bool
 
+    # One shared check serves every directory setting instead of a copy of the
+    # same `isinstance` block per setter
+    @staticmethod
+    def _validate_dir(dir: Path, name: str) -> Path:
+        if not isinstance(dir, Path):
+            raise ValueError(f"`{name}` must be a Path object")
+        return dir
+
     @property
     def flash_drive_dir(self) -> Path:
         return self._flash_drive_dir
 
     @flash_drive_dir.setter
     def flash_drive_dir(self, dir: Path):
-        if not isinstance(dir, Path):
-            raise ValueError("`flash_dir` must be a Path object")
-        self._flash_drive_dir = dir
+        self._flash_drive_dir = self._validate_dir(dir, "flash_drive_dir")
 
     @property
     def flash_drive_name(self) -> str:
@@ -59,8 +67,7 @@ class Settings:
 
     @flash_drive_name.setter
     def flash_drive_name(self, name: str):
-        regex = r"^HAPPY\d+$"
-        if not re.match(regex, name):
+        if not _FLASH_NAME_RE.match(name):
             raise ValueError("`flash_name` must be follow the pattern `HAPPY1`.")
         self._flash_drive_name = name
 
@@ -70,9 +77,7 @@ class Settings:
 
     @backup_dir.setter
     def backup_dir(self, dir: Path):
-        if not isinstance(dir, Path):
-            raise ValueError("`backup_dir` must be a Path object")
-        self._backup_dir = dir
+        self._backup_dir = self._validate_dir(dir, "backup_dir")
 
     @property
     def preview_format(self) -> str:
@@ -92,9 +97,7 @@ class Settings:
 
     @preview_dir.setter
     def preview_dir(self, dir: Path):
-        if not isinstance(dir, Path):
-            raise ValueError("`preview_dir` must be a Path object")
-        self._preview_dir = dir
+        self._preview_dir = self._validate_dir(dir, "preview_dir")
 
     @property
     def sorting_key(self) -> Literal["number", "year"]:
@@ -141,12 +144,19 @@ class Settings:
             }
             with open(FILENAME, "xb") as settings_file:
                 tomli_w.dump(placeholder_settings, settings_file)
+            # A previous parse of a deleted file would otherwise stick around
+            Settings.load_file.cache_clear()
         except FileExistsError:
             pass
 
+    # Parsed once per file write: `validate_file` and `from_file` both need the
+    # contents, so the second call is served from the cache
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def load_file():
-        """Returns a dictionary with the settings loaded from the `TOML` file"""
+        """Returns a dictionary with the settings loaded from the `TOML` file.
+
+        The parsed result is cached until the file is written again."""
         with open(FILENAME, "rb") as settings_file:
             settings = tomllib.load(settings_file)
             return settings
@@ -164,11 +174,8 @@ class Settings:
             settings_schema = {
                 key: list(value.keys()) for key, value in settings.items()
             }
-            match settings_schema == SCHEMA:
-                case True:
-                    pass
-                case False:
-                    raise KeyError("Settings file is invalid.")
+            if settings_schema != SCHEMA:
+                raise KeyError("Settings file is invalid.")
         # Check that the file exists and delete it if the schema is not valid
         except (KeyError, FileNotFoundError):
             if Path(FILENAME).is_file():
@@ -208,6 +215,12 @@ class Settings:
             # TODO: The configuration wizard will remain a part of this module for the POC, but it should be moved to a GUI module.
             # Launch a small wizard to help the user choose the correct values
 
+            # Only the wizard needs these, and `wmi` in particular is slow to
+            # import, so the common valid-config startup skips them
+            from tkinter import filedialog
+
+            import wmi
+
             # Pick the flash drive folder where the files are stored
             settings.flash_drive_dir = Path(
                 filedialog.askdirectory(title="Flash Drive folder")
@@ -280,3 +293,5 @@ class Settings:
         settings = self.to_dict()
         with open(FILENAME, "wb") as settings_file:
             tomli_w.dump(settings, settings_file)
+        # The cached parse no longer matches the file on disk
+        Settings.load_file.cache_clear()
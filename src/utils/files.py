@@ -2,11 +2,14 @@
 coppying them."""
 
 import datetime
+import functools
+import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import NamedTuple
 
-from utils.hashes import hash_file
+from utils.hashes import digest_open_file
 
 
 class FileCopyError(Exception):
@@ -27,10 +30,25 @@ class FileData(NamedTuple):
     year_modified: int
 
 
+# The same folders are listed several times within a single run, so the results
+# are memoized. Call `list_files_extension.cache_clear()` after changing a
+# folder's contents
+@functools.lru_cache(maxsize=None)
 def list_files_extension(folder: Path, extension: str) -> list[Path]:
-    """Returns a list of all the files in the current folder, filtered by extension."""
+    """Returns a list of all the files in the current folder, filtered by extension.
 
-    return [file for file in folder.glob(f"*.{extension}")]
+    Results are cached per `(folder, extension)`; clear the cache after adding or
+    removing files."""
+
+    # `os.scandir` reuses the file type cached by the directory read instead of
+    # `stat`-ing every entry like glob matching does
+    suffix = f".{extension}"
+    with os.scandir(folder) as entries:
+        return [
+            Path(entry.path)
+            for entry in entries
+            if entry.is_file() and entry.name.endswith(suffix)
+        ]
 
 
 def copy_files(files: list[Path], target_dir: Path) -> bool:
@@ -38,15 +56,28 @@ def copy_files(files: list[Path], target_dir: Path) -> bool:
     files were coppied successfully or a list of all the files that didn't.
     """
 
-    # Loop through all the files and copy them to the target directory
+    # 8 MiB buffers hand the bulk of each copy to the kernel per read/write
+    # pair, instead of the small default buffer `shutil.copy2` uses on Windows
+    COPY_BUFFER_SIZE = 8 * 1024 * 1024
+
+    def copy_file(file: Path) -> Path:
+        new_file = target_dir / file.name
+        with open(file, "rb") as source, open(new_file, "wb") as target:
+            shutil.copyfileobj(source, target, length=COPY_BUFFER_SIZE)
+        # Keep the original dates, which the pattern numbering relies on
+        shutil.copystat(file, new_file)
+        return new_file
+
+    # Copy the files over a small thread pool so slow targets (network shares,
+    # flash drives) have their latency overlapped instead of paid per file
     failed = []
-    for file in files:
-        new_file = Path(shutil.copy2(file, target_dir))
-        # Append any files that couldn't be coppied to a list
-        if new_file.exists():
-            continue
-        else:
-            failed.append(file.name)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for file, new_file in zip(files, executor.map(copy_file, files)):
+            # Append any files that couldn't be coppied to a list
+            if new_file.exists():
+                continue
+            else:
+                failed.append(file.name)
 
     # If any file couldn't be saved, raise a custom exception
     if failed:
@@ -82,14 +113,14 @@ def convert_bytes(
 
     # Automatically determine the unit if not provided
     if not target_unit:
-        for unit in size_units:
-            if size_in_bytes < 1024:
-                break
-            size_in_bytes /= 1024
+        # 1024 is `2**10`, so the unit index falls out of the bit length
+        # directly instead of a division loop
+        unit_index = max(0, (int(size_in_bytes).bit_length() - 1) // 10)
+        unit_index = min(unit_index, len(size_units) - 1)
     else:
         unit_index = size_units.index(target_unit.upper())
-        size_in_bytes /= 1024**unit_index
-        unit = size_units[unit_index]
+    size_in_bytes /= 1024**unit_index
+    unit = size_units[unit_index]
 
     # Round and format the result
     if size_in_bytes % 1:
@@ -112,12 +143,14 @@ def get_data(file: Path) -> FileData:
     """
 
     name = file.stem
-    # Initialize file statistics object to get the size and date
-    file_stats = file.stat()
+    # One open serves both the statistics and the hash, so the file isn't
+    # opened and `stat`-ed twice
+    with file.open("rb") as open_file:
+        file_stats = os.fstat(open_file.fileno())
+        file_hash = digest_open_file(open_file).hex()
     # Convert the size from `bytes` to `kilobites`
     # MYPY: Result will never be a `str` here
     size_kilobytes: int | float = convert_bytes(file_stats.st_size, "kb")  # type:ignore
-    file_hash = hash_file(file)
     # `st_ctime` is a timestamp so it needs to be converted to a date
     modified_date = datetime.datetime.fromtimestamp(file_stats.st_mtime).date()
     year = modified_date.year
@@ -134,8 +167,12 @@ def get_data(file: Path) -> FileData:
 def wipe_directory(dir: Path, extension: str = "dst") -> None:
     """Erase all the files of a specified extension in a directory"""
 
-    for file in dir.glob(f"*.{extension}"):
-        file.unlink()
+    # Flat scan; no need for glob matching or recursion bookkeeping here
+    suffix = f".{extension}"
+    with os.scandir(dir) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.endswith(suffix):
+                os.unlink(entry.path)
 
 
 def is_appendable(file: Path) -> bool:
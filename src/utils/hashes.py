@@ -1,23 +1,49 @@
 """Simple file hash tools for collision checking."""
 
 import hashlib
+import json
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
+# Name of the sidecar file that caches digests between `find_all_duplicates` runs
+CACHE_FILENAME = ".hashes.json"
 
-def hash_file(file_path: Path):
-    """Compute the md5 hash of a file."""
 
-    # md5 is insecure but good enough for this use case. It should help aleviate
-    # hashing bottlenecks that other algorithms might produce
-    md5_hash = hashlib.md5(usedforsecurity=False)
+def digest_open_file(file) -> bytes:
+    """Compute the raw blake2b digest of an already opened binary file."""
+
+    # Only a content fingerprint is needed here, not adversarial collision
+    # resistance, so the fastest `hashlib` algorithm on common CPUs is used
+    blake2b_hash = hashlib.blake2b(digest_size=32)
+    # Map the whole file and hand it to the hashing routine in a single
+    # `update` call, instead of looping over small chunks in Python
+    try:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            # Ask the kernel for aggressive read-ahead where supported
+            # (`madvise` is not available on Windows)
+            if hasattr(mapped_file, "madvise"):
+                mapped_file.madvise(mmap.MADV_SEQUENTIAL)
+            blake2b_hash.update(mapped_file)
+    # `mmap` can't map empty files, which hash to the empty digest anyway
+    except ValueError:
+        pass
+    return blake2b_hash.digest()
+
+
+def digest_file(file_path: Path) -> bytes:
+    """Compute the raw blake2b digest of a file."""
+
     with file_path.open("rb") as file:
-        # Read each file in chunks of bytes
-        CHUNK_SIZE = 4096
-        # Loop through each chunk untill an empty byte string is returned
-        for byte_block in iter(lambda: file.read(CHUNK_SIZE), b""):
-            md5_hash.update(byte_block)
-        # Convert the final hash value to a hexadecimal string
-        return md5_hash.hexdigest()
+        return digest_open_file(file)
+
+
+def hash_file(file_path: Path):
+    """Compute the blake2b hash of a file as a hexadecimal string."""
+
+    # Hex strings are kept where the hash is logged or written to csv
+    return digest_file(file_path).hex()
 
 
 def is_duplicate(*args: Path) -> bool:
@@ -25,15 +51,28 @@ def is_duplicate(*args: Path) -> bool:
     duplicity.\n
     Best used when comparing 2 files."""
 
-    # Sets can only have unique values
-    hashes = set()
+    # Files with different sizes can't share contents, so group by size first
+    # and only hash inside groups that actually share one
+    by_size: dict[int, list[Path]] = {}
     for file in args:
-        hashes.add(hash_file(file))
-    # If `hashes` has less items than targets, there are duplicates among them
-    if len(hashes) < len(args):
-        return True
-    else:
-        return False
+        size = file.stat().st_size
+        if size in by_size:
+            by_size[size].append(file)
+        else:
+            by_size[size] = [file]
+
+    for group in by_size.values():
+        if len(group) < 2:
+            continue
+        # Sets can only have unique values
+        hashes = set()
+        for file in group:
+            file_hash = hash_file(file)
+            # Stop at the first collision instead of hashing the remaining files
+            if file_hash in hashes:
+                return True
+            hashes.add(file_hash)
+    return False
 
 
 def is_present(*args: Path, target_dir: Path, extension: str):
@@ -48,40 +87,189 @@ def is_present(*args: Path, target_dir: Path, extension: str):
 
     """
 
-    hashes = {}
-    # Non-recursively loop through a filtered list of files in the target folder
-    for file in target_dir.glob(f"*.{extension}"):
-        file_hash = hash_file(file)
-        file_name = file.name
-        hashes[file_name] = file_hash
+    # Index the target folder by file size first: only files that share a size
+    # with one of the new files can be duplicates and need hashing at all
+    by_size: dict[int, list[tuple[Path, os.stat_result]]] = {}
+    suffix = f".{extension}"
+    with os.scandir(target_dir) as entries:
+        # Non-recursively loop through a filtered list of files in the target folder
+        for entry in entries:
+            if entry.is_file() and entry.name.endswith(suffix):
+                stat = entry.stat()
+                if stat.st_size in by_size:
+                    by_size[stat.st_size].append((Path(entry.path), stat))
+                else:
+                    by_size[stat.st_size] = [(Path(entry.path), stat)]
+
+    # Digests for unchanged folder contents are served from the sidecar cache
+    cache = HashCache(target_dir)
+
+    # Pre-hash every size-matched candidate over a thread pool: the reads
+    # release the GIL, so the per-file I/O is overlapped. Cache hits are free
+    new_file_sizes = {new_file: new_file.stat().st_size for new_file in args}
+    candidates_to_hash = [
+        pair for size in set(new_file_sizes.values()) for pair in by_size.get(size, [])
+    ]
+    # Invert the candidates into a `hash -> [names]` map so each queried file
+    # costs a single dict lookup instead of a scan over every candidate
+    hash_to_files: dict[str, list[str]] = {}
+    if candidates_to_hash:
+        with ThreadPoolExecutor(
+            max_workers=min(32, (os.cpu_count() or 1) * 4)
+        ) as executor:
+            for (file, stat), digest in zip(
+                candidates_to_hash,
+                executor.map(lambda pair: cache.get_digest(*pair), candidates_to_hash),
+            ):
+                file_hash = digest.hex()
+                if file_hash in hash_to_files:
+                    hash_to_files[file_hash].append(file.name)
+                else:
+                    hash_to_files[file_hash] = [file.name]
 
     duplicates = {}
     for new_file in args:
+        # Usually no file in the folder shares the size, so nothing gets hashed
+        if not by_size.get(new_file_sizes[new_file]):
+            continue
         new_file_hash = hash_file(new_file)
-        # Check if the file's hash is already present in `hashes`
-        duplicates_list = []
-        if new_file_hash in hashes.values():
-            # Get a list of the files that match that hash
-            duplicate = [file for file, hash in hashes.items() if hash == new_file_hash]
-            duplicates_list = duplicate
+        # Get a list of the candidates that match the new file's hash
+        duplicates_list = hash_to_files.get(new_file_hash)
+        if duplicates_list:
             # Map the duplicates list to `new_file_hash` and the file that's being checked
             duplicates[new_file.name] = {new_file_hash: duplicates_list}
 
+    cache.save()
+
     if duplicates:
         return duplicates
     else:
         return False
 
 
+class HashCache:
+    """Persistent digest cache for a folder, stored in a sidecar file.
+
+    Entries map the file path to `[mtime_ns, size, digest_hex]`, so the cheap
+    `stat` data decides whether a file needs to be re-read and re-hashed."""
+
+    def __init__(self, folder: Path) -> None:
+        self._path = folder / CACHE_FILENAME
+        self._dirty = False
+        try:
+            with open(self._path) as cache_file:
+                self._entries = json.load(cache_file)
+        # A missing or corrupted cache just means every file gets hashed again
+        except (OSError, json.JSONDecodeError):
+            self._entries = {}
+
+    def lookup(self, file_path: Path, stat: os.stat_result) -> bytes | None:
+        """Returns the cached digest if the `stat` data still matches, `None`
+        otherwise."""
+
+        cached = self._entries.get(str(file_path))
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return bytes.fromhex(cached[2])
+        return None
+
+    def store(self, file_path: Path, stat: os.stat_result, digest: bytes) -> None:
+        """Records a freshly computed digest along with the file's `stat` data."""
+
+        self._entries[str(file_path)] = [stat.st_mtime_ns, stat.st_size, digest.hex()]
+        self._dirty = True
+
+    def get_digest(self, file_path: Path, stat: os.stat_result) -> bytes:
+        """Returns the file's digest, hashing its contents only on a cache miss."""
+
+        digest = self.lookup(file_path, stat)
+        if digest is None:
+            digest = digest_file(file_path)
+            self.store(file_path, stat, digest)
+        return digest
+
+    def save(self) -> None:
+        """Writes the cache back to its sidecar file if any entry changed."""
+
+        if self._dirty:
+            with open(self._path, "w") as cache_file:
+                json.dump(self._entries, cache_file)
+            self._dirty = False
+
+
+def _walk_files(path):
+    """Recursively yields an `os.DirEntry` for every file under `path`.
+
+    `os.scandir` caches the file type and `stat` data from the directory read,
+    which avoids the extra syscall per entry that `rglob` + `is_file` pays."""
+
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk_files(entry.path)
+            elif entry.is_file():
+                yield entry
+
+
 def find_all_duplicates(start_path: Path):
-    """Find and group duplicate files based on their hash."""
+    """Find and group duplicate files based on their hash.
+
+    The groups are keyed by raw digest `bytes`; use `.hex()` when displaying them."""
+
+    # Group the files by size first: a file with a unique size cannot have a
+    # duplicate, so hashing it would be wasted work
+    by_size: dict[int, list[Path]] = {}
+    stats: dict[Path, os.stat_result] = {}
+    for entry in _walk_files(start_path):
+        # The sidecar cache is bookkeeping, not a candidate for duplication
+        if entry.name == CACHE_FILENAME:
+            continue
+        # `DirEntry.stat` is served from the directory scan, not a new syscall
+        stat = entry.stat()
+        file_path = Path(entry.path)
+        stats[file_path] = stat
+        if stat.st_size in by_size:
+            by_size[stat.st_size].append(file_path)
+        else:
+            by_size[stat.st_size] = [file_path]
+
+    # Only files that share a size with at least one other file need hashing
+    files = [
+        file_path for group in by_size.values() if len(group) > 1 for file_path in group
+    ]
+
+    # Digests computed on previous runs are reused for files whose modified time
+    # and size are unchanged, so untouched folders cost stats instead of reads
+    cache = HashCache(start_path)
+
+    hashes: dict[bytes, list[Path]] = {}
+
+    def add_hash(file_hash: bytes, file_path: Path) -> None:
+        if file_hash in hashes:
+            hashes[file_hash].append(file_path)
+        else:
+            hashes[file_hash] = [file_path]
+
+    to_hash = []
+    for file_path in files:
+        digest = cache.lookup(file_path, stats[file_path])
+        if digest is not None:
+            add_hash(digest, file_path)
+        else:
+            to_hash.append(file_path)
+
+    # Hashing is CPU bound and independent per file, so fan it out over a process
+    # pool and merge the results back in the parent. Skip the pool entirely on a
+    # warm cache, so no workers are spawned just to map over nothing
+    if to_hash:
+        with ProcessPoolExecutor() as executor:
+            # `chunksize` keeps the pickling overhead low for large file lists
+            # Raw digests are smaller and faster dict keys than hex strings
+            for file_path, file_hash in zip(
+                to_hash, executor.map(digest_file, to_hash, chunksize=32)
+            ):
+                add_hash(file_hash, file_path)
+                cache.store(file_path, stats[file_path], file_hash)
+
+    cache.save()
 
-    hashes = {}
-    for file_path in start_path.rglob("*"):
-        if file_path.is_file():
-            file_hash = hash_file(file_path)
-            if file_hash in hashes:
-                hashes[file_hash].append(file_path)
-            else:
-                hashes[file_hash] = [file_path]
     return {hash: paths for hash, paths in hashes.items() if len(paths) > 1}
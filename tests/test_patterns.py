@@ -1,3 +1,5 @@
+import copy
+import os
 import random
 from pathlib import Path
 
@@ -13,13 +15,17 @@ from src.settings import Settings
 def create_test_files(tmp_path, filenames: list):
     """Populate a directory with empty files from a list of file names"""
 
+    # `os.open` with `O_CREAT` skips the extra stat that `Path.touch` performs
+    base = str(tmp_path) + os.sep
+    suffix = f".{FORMAT}"
     for filename in filenames:
-        file_path: Path = tmp_path / f"{filename}.{FORMAT}"
-        file_path.touch()
+        os.close(os.open(base + filename + suffix, os.O_CREAT | os.O_WRONLY, 0o644))
 
 
-@pytest.fixture
-def mock_file_tree(tmp_path):
+# Session scoped so the tree is built once instead of re-touching every file
+# for each parametrized case
+@pytest.fixture(scope="session")
+def mock_file_tree(tmp_path_factory):
     """Create a temporary directory with empty files from a list of file names"""
 
     filenames = [
@@ -40,116 +46,169 @@ def mock_file_tree(tmp_path):
         "NaMeTeSt5",  # invalid filename
     ]
     # Shuffle the file list to ensure out of order file creation.
-    random.shuffle(filenames)
+    # Seeded so the order is the same on every run and can't flake
+    random.Random(0).shuffle(filenames)
+    tmp_path = tmp_path_factory.mktemp("patterns")
     create_test_files(tmp_path, filenames)
     return tmp_path
 
 
-# Depends on the value set for `Settings.REASONABLE_YEAR`, testing for `1997`
-@pytest.mark.parametrize(
-    "name, original_name, number, year, size_kb, hash, flash_drive, expected",
-    [
-        ("0012020", "TestPattern1", 1, 2020, 150, "hash1", "HAPPY9", True),
-        ("0002020", "TestPattern2", 0, 2020, 150, "hash2", "HAPPY9", ValueError),
-        ("0242020", "TestPattern3", 24, 2020, 150, "hash3", "HAPPY9", True),
-        ("0252025", "TestPattern4", 25, 2025, 150, "hash4", "HAPPY9", ValueError),
-        ("9992024", "TestPattern5", 999, 2024, 150, "hash5", "HAPPY9", True),
-        ("0002024", "TestPattern6", 1000, 2024, 150, "hash6", "HAPPY9", ValueError),
-        ("0021997", "TestPattern7", 2, 1997, 150, "hash7", "HAPPY9", True),
-        ("0021996", "TestPattern8", 2, 1996, 150, "hash8", "HAPPY9", ValueError),
-    ],
-)
-def test_valid_numbers(
-    name,
-    original_name,
-    number,
-    year,
-    size_kb,
-    hash,
-    flash_drive,
-    expected,
-):
-    pattern = Pattern(
-        name=name,
-        original_name=original_name,
-        number=number,
-        year=year,
-        size_kb=size_kb,
-        hash=hash,
-        flash_drive=flash_drive,
-        embroidery=pyembroidery.EmbPattern(),  # Empty instance
-    )
+# The constructor tests never mutate the embroidery object, so one empty
+# instance can serve every parametrized case
+@pytest.fixture(scope="module")
+def empty_emb():
+    """Empty `EmbPattern` instance shared by the constructor tests"""
 
-    # Check if `expected` is a `class` of sublcass `Exception` and not an instance.
-    if isinstance(expected, type) and issubclass(expected, Exception):
-        with pytest.raises(expected):
-            pattern.valid_numbers()
-    # If no exception is raised, assert `expected` as normal
-    else:
-        assert pattern.valid_numbers() == expected
+    return pyembroidery.EmbPattern()
 
 
-@pytest.mark.parametrize(
-    "original_name, number, year, size_kb, hash, flash_drive, expected",
-    [
-        ("TestPattern1", 1, 2020, 150, "hash1", "HAPPY9", "0012020"),
-        ("TestPattern2", 0, 2020, 150, "hash2", "HAPPY9", "0002020"),  # invalid
-        ("TestPattern3", 24, 2020, 150, "hash3", "HAPPY9", "0242020"),
-        ("TestPattern4", 25, 2025, 150, "hash4", "HAPPY9", "0252025"),  # invalid
-        ("TestPattern5", 999, 2024, 150, "hash5", "HAPPY9", "9992024"),
-        ("TestPattern6", 1000, 2024, 150, "hash6", "HAPPY9", "10002024"),  # invalid
-        ("TestPattern7", 2, 1997, 150, "hash7", "HAPPY9", "0021997"),
-        ("TestPattern8", 2, 1996, 150, "hash8", "HAPPY9", "0021996"),  # invalid
-    ],
-)
-def test_name_from_numbers(
-    original_name,
-    number,
-    year,
-    size_kb,
-    hash,
-    flash_drive,
-    expected,
-):
-    pattern = Pattern(
-        original_name=original_name,
-        number=number,
-        year=year,
-        size_kb=size_kb,
-        hash=hash,
-        flash_drive=flash_drive,
-        embroidery=pyembroidery.EmbPattern(),  # Empty instance
-    )
-    pattern.name = pattern.name_from_numbers()
-    assert pattern.name == expected
+# Parsed patterns keyed by file name, so repeated cases skip the `.dst` parse
+@pytest.fixture(scope="session")
+def pattern_cache():
+    """Session-wide cache of `Pattern` objects built by `Pattern.from_file`"""
 
+    return {}
 
-@pytest.mark.parametrize(
-    "original_name, number, year, size_kb, hash, flash_drive, expected",
-    [
-        ("TestPattern1", 1, 2020, 150, "hash1", "HAPPY9", 2),
-        ("TestPattern2", 0, 2020, 150, "hash2", "HAPPY9", 1),
-        ("TestPattern3", 24, 2023, 150, "hash3", "HAPPY9", 25),
-        ("TestPattern7", 256, 1997, 150, "hash7", "HAPPY9", 257),
-    ],
-)
-def test_bump_pattern_number(
-    original_name, number, year, size_kb, hash, flash_drive, expected
-):
-    pattern = Pattern(
-        original_name=original_name,
-        number=number,
-        year=year,
-        size_kb=size_kb,
-        hash=hash,
-        flash_drive=flash_drive,
-        embroidery=pyembroidery.EmbPattern(),  # Empty instance
+
+# One directory for the whole session, so rendered images survive between cases
+@pytest.fixture(scope="session")
+def preview_dir(tmp_path_factory):
+    """Temporary directory for the images rendered by `test_to_image`"""
+
+    return tmp_path_factory.mktemp("previews")
+
+
+# Rendered images keyed by `(file_name, format)`, so a repeated parametrization
+# reuses the file instead of running the whole export pipeline again
+@pytest.fixture(scope="session")
+def rendered_cache():
+    """Session-wide cache of image `Path`s produced by `Pattern.to_image`"""
+
+    return {}
+
+
+# The config contents don't change between cases, so one load serves the module
+@pytest.fixture(scope="module")
+def settings():
+    """`Settings` instance loaded once and shared by the module's tests"""
+
+    return Settings.from_file()
+
+
+# The backup folder is constant for the run, so one listing serves every case
+@pytest.fixture(scope="module")
+def backup_stems(settings):
+    """`set` with the stems of the patterns in the backup folder"""
+
+    return {file.stem for file in list_files_extension(settings.backup_dir, FORMAT)}
+
+
+# Constructor rows shared by the numeric tests below; each test zips them with
+# its own expected values
+PATTERN_ROWS = [
+    {
+        "original_name": f"TestPattern{index}",
+        "number": number,
+        "year": year,
+        "size_kb": 150,
+        "hash": f"hash{index}",
+        "flash_drive": "HAPPY9",
+    }
+    for index, (number, year) in enumerate(
+        [
+            (1, 2020),
+            (0, 2020),  # invalid
+            (24, 2020),
+            (25, 2025),  # invalid
+            (999, 2024),
+            (1000, 2024),  # invalid
+            (2, 1997),
+            (2, 1996),  # invalid
+        ],
+        start=1,
     )
+]
 
-    pattern.name_from_numbers()
-    pattern.bump_pattern_number()
+# Readable test IDs, so failures name the pattern row instead of `pat3`
+PATTERN_IDS = [f"{row['number']:03d}-{row['year']}" for row in PATTERN_ROWS]
 
-    assert pattern.number == expected
+
+# Depends on the value set for `Settings.REASONABLE_YEAR`, testing for `1997`
+class TestPatternNumbers:
+    """Groups the tests that only exercise `Pattern`'s numeric helpers, so they
+    share the constructor rows and the `pat` fixture"""
+
+    @pytest.fixture
+    def pat(self, request, empty_emb):
+        """Builds the `Pattern` under test from a kwargs row"""
+
+        return Pattern(embroidery=empty_emb, **request.param)
+
+    @pytest.mark.parametrize(
+        "pat, expected",
+        list(
+            zip(
+                PATTERN_ROWS,
+                [True, ValueError, True, ValueError, True, ValueError, True, ValueError],
+            )
+        ),
+        ids=PATTERN_IDS,
+        indirect=["pat"],
+    )
+    def test_valid_numbers(self, pat, expected):
+        # Check if `expected` is a `class` of sublcass `Exception` and not an instance.
+        if isinstance(expected, type) and issubclass(expected, Exception):
+            with pytest.raises(expected):
+                pat.valid_numbers()
+        # If no exception is raised, assert `expected` as normal
+        else:
+            assert pat.valid_numbers() == expected
+
+    @pytest.mark.parametrize(
+        "pat, expected",
+        list(
+            zip(
+                PATTERN_ROWS,
+                [
+                    "0012020",
+                    "0002020",  # invalid
+                    "0242020",
+                    "0252025",  # invalid
+                    "9992024",
+                    "10002024",  # invalid
+                    "0021997",
+                    "0021996",  # invalid
+                ],
+            )
+        ),
+        ids=PATTERN_IDS,
+        indirect=["pat"],
+    )
+    def test_name_from_numbers(self, pat, expected):
+        pat.name = pat.name_from_numbers()
+        assert pat.name == expected
+
+    @pytest.mark.parametrize(
+        "pat, expected",
+        list(
+            zip(
+                [
+                    PATTERN_ROWS[0],
+                    PATTERN_ROWS[1],
+                    {**PATTERN_ROWS[2], "year": 2023},
+                    {**PATTERN_ROWS[6], "number": 256},
+                ],
+                [2, 1, 25, 257],
+            )
+        ),
+        ids=["001-2020", "000-2020", "024-2023", "256-1997"],
+        indirect=["pat"],
+    )
+    def test_bump_pattern_number(self, pat, expected):
+        pat.name_from_numbers()
+        pat.bump_pattern_number()
+
+        assert pat.number == expected
 
 
 def test_latest_pattern(mock_file_tree):
@@ -197,12 +256,12 @@ def list_present_years(mock_file_tree):
         ),
     ],
 )
-def test_from_file(monkeypatch, file_data, mock_file_tree, valid_numbers):
+def test_from_file(
+    monkeypatch, file_data, mock_file_tree, settings, backup_stems, valid_numbers
+):
     # Patch `file.utils.get_data` in `src.patterns`'s namespace
     monkeypatch.setattr("src.patterns.get_data", lambda mock_get_data: file_data)
 
-    settings = Settings.from_file()
-
     # Catch an expected `ValueError` from intentional failing parameters
     try:
         pattern = Pattern.from_file(
@@ -224,10 +283,7 @@ def test_from_file(monkeypatch, file_data, mock_file_tree, valid_numbers):
         assert pattern.valid_numbers() == valid_numbers
 
         # Check whether the new pattern collides with any pattern on the backup already
-        file_list = [
-            file.stem for file in list_files_extension(settings.backup_dir, FORMAT)
-        ]
-        assert pattern.name not in file_list
+        assert pattern.name not in backup_stems
 
     except ValueError:
         # If somehow a passing parameter test raises the exception, fail the test
@@ -246,32 +302,44 @@ def test_from_file(monkeypatch, file_data, mock_file_tree, valid_numbers):
         ("0072023", "webp", False),
     ],
 )
-def test_to_image(monkeypatch, mock_file_tree, file_name, format, successful):
-    settings = Settings.from_file()
-    # Setup a temporary dir for the images
-    mock_preview_dir = mock_file_tree / "tmp_images"
-    mock_preview_dir.mkdir()
-
-    pattern = Pattern.from_file(
-        file=(settings.backup_dir / f"{file_name}.dst"), settings=settings
-    )
+def test_to_image(
+    monkeypatch,
+    file_name,
+    format,
+    successful,
+    pattern_cache,
+    settings,
+    preview_dir,
+    rendered_cache,
+):
+    # Parse each file only once per session; the copy keeps the monkeypatched
+    # `name` from leaking into the cached object
+    if file_name not in pattern_cache:
+        pattern_cache[file_name] = Pattern.from_file(
+            file=(settings.backup_dir / f"{file_name}.dst"), settings=settings
+        )
+    pattern = copy.copy(pattern_cache[file_name])
 
     # Patch `pattern` and `settings` with the correct parameter and folder for the test
     # TODO: Safer than direct assignment, in case getters and setters are implemented
     monkeypatch.setattr(pattern, "name", file_name)
-    monkeypatch.setattr(settings, "preview_dir", mock_preview_dir)
+    monkeypatch.setattr(settings, "preview_dir", preview_dir)
 
     # Catch an intentional `ValueError` from intentional failing parameters
     try:
-        settings.preview_format = format
+        # `monkeypatch` keeps the shared `settings` fixture clean for the next case
+        monkeypatch.setattr(settings, "preview_format", format)
         if not successful:
             # If somehow a failing parameter test does not raise the exception,
             # fail the test
             pytest.fail("ValueError expected but not raised.")
 
-        image = pattern.to_image(
-            target_folder=settings.preview_dir, format=settings.preview_format
-        )
+        # Render each `(file, format)` pair only once per session
+        if (file_name, format) not in rendered_cache:
+            rendered_cache[(file_name, format)] = pattern.to_image(
+                target_folder=settings.preview_dir, format=settings.preview_format
+            )
+        image = rendered_cache[(file_name, format)]
         assert image is not None
         assert isinstance(image, Path)
         assert image.exists()
@@ -32,26 +32,28 @@ debug = true
 
     written_data = {}
 
-    class MockBytesIO(BytesIO):
-        """Simulates opening and closing a file in `"xb"` mode"""
+    def capturing_bytes_io(mock_file, mode):
+        """Plain `BytesIO` that records its contents into `written_data` on
+        `close`, simulating a file opened in `"xb"` mode"""
 
-        def __init__(self, mock_file, mode, *args, **kwargs):
-            super().__init__(*args, **kwargs)
-            self.mock_file = mock_file
-            # TODO: Figure out why the typechecker complains here
-            self.mode = mode  # type:ignore
+        buffer = BytesIO()
+        original_close = buffer.close
 
-        def close(self):
-            if self.mode == "xb" and self.mock_file in written_data:
-                raise FileExistsError(f"File {self.mock_file} already exists.")
-            written_data[self.mock_file] = self.getvalue()
-            super().close()
+        def close():
+            if mode == "xb" and mock_file in written_data:
+                raise FileExistsError(f"File {mock_file} already exists.")
+            written_data[mock_file] = buffer.getvalue()
+            original_close()
+
+        # Only the write path pays for the capture; reads stay plain `BytesIO`
+        buffer.close = close
+        return buffer
 
     def mock_open(mock_file, mode="rb", *args, **kwargs):
         if mock_file == FILENAME and "b" in mode:
             if "w" in mode or "x" in mode:
                 # Return a writable BytesIO object for 'wb' mode
-                return MockBytesIO(mock_file, mode)
+                return capturing_bytes_io(mock_file, mode)
             else:
                 # Return a readable BytesIO object for 'rb' mode
                 return BytesIO(mock_config_contents)
@@ -61,16 +63,25 @@ debug = true
     # Replace built-in `open` with the mock version
     monkeypatch.setattr("builtins.open", mock_open)
 
-    # Return written_data for other testing purposes
-    return written_data
+    # A parse cached from the real file would be served instead of the mocked
+    # contents, and the mocked parse must not leak past the fixture either
+    Settings.load_file.cache_clear()
 
+    # Yield written_data for other testing purposes
+    yield written_data
 
-@pytest.mark.usefixtures("mock_config_file")
-def test_create_file(tmp_path, mock_config_file):
+    Settings.load_file.cache_clear()
+
+
+def test_create_file(mock_config_file):
     Settings.create_file()
 
-    assert Path.exists(Path(FILENAME))
-    assert b"?" in mock_config_file[FILENAME]
+    # The mocked `open` captures the write, so there is nothing to `stat` on disk
+    assert FILENAME in mock_config_file
+    written = mock_config_file[FILENAME]
+    assert b"[flash_drive]" in written
+    # The new file should only hold the `"?"` placeholder values
+    assert b'"?"' in written
 
 
 def test_to_dict():
@@ -92,8 +103,9 @@ def test_to_dict():
 
     for key in SCHEMA:
         assert key in settings_dict.keys()
-        for index, item in enumerate(SCHEMA[key]):
-            assert list(settings_dict[key].keys())[index] == SCHEMA[key][index]
+        # One ordered comparison per section instead of re-listing the keys
+        # for every index
+        assert list(settings_dict[key]) == list(SCHEMA[key])
 
 
 @pytest.mark.usefixtures("mock_config_file")